@@ -2,13 +2,22 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from datetime import datetime, timedelta
-from database import get_session, DailyRecord, OtherExpense, init_db
+from sqlalchemy import func, select
+from database import engine, get_session, DailyRecord, OtherExpense, init_db
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Serialize Plotly figures with orjson when it is installed
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    pass
+
 st.set_page_config(
     page_title="Car Business Analytics",
     page_icon="🚗",
@@ -60,50 +69,99 @@ check_authentication()
 st.title("🚗 Car Business Analytics Dashboard")
 
 
+@st.cache_resource
+def get_engine():
+    """Create tables once per server process and share the pooled engine"""
+    init_db()
+    return engine
+
+
+# Columns added by load_data() for filtering/grouping, hidden from tables
+DERIVED_COLUMNS = ["month", "iso_year", "iso_week", "profit_margin"]
+
+# Show parsed dates without a time component
+DATE_COLUMN_CONFIG = {"date": st.column_config.DateColumn("date")}
+
+
 @st.cache_data(ttl=60)
 def load_data():
-    session = get_session()
-    try:
-        records = session.query(DailyRecord).order_by(DailyRecord.date).all()
-        data = [{
-            "date": r.date,
-            "ride_count": r.ride_count,
-            "earnings": r.earnings,
-            "cng_expenses": r.cng_expenses,
-            "driver_pass_subscription": r.driver_pass_subscription or 0,
-            "indrive_topup": r.indrive_topup or 0,
-            "odometer_start": r.odometer_start,
-            "odometer_end": r.odometer_end,
-            "daily_net": r.daily_net,
-        } for r in records]
-        return pd.DataFrame(data)
-    finally:
-        session.close()
+    """Load daily records plus the sorted month labels for the sidebar"""
+    stmt = select(
+        DailyRecord.date,
+        DailyRecord.ride_count,
+        DailyRecord.earnings,
+        DailyRecord.cng_expenses,
+        func.coalesce(DailyRecord.driver_pass_subscription, 0).label("driver_pass_subscription"),
+        func.coalesce(DailyRecord.indrive_topup, 0).label("indrive_topup"),
+        DailyRecord.odometer_start,
+        DailyRecord.odometer_end,
+        DailyRecord.daily_net.label("daily_net"),
+    ).order_by(DailyRecord.date)
+    df = pd.read_sql(stmt, con=get_engine(), parse_dates=["date"])
+
+    # Derived calendar columns, computed once per cache fill
+    iso = df["date"].dt.isocalendar()
+    df["month"] = df["date"].dt.to_period("M")
+    df["iso_year"] = iso.year
+    df["iso_week"] = iso.week
+    df["profit_margin"] = (df["daily_net"] / df["earnings"] * 100).fillna(0)
+
+    month_strs = [str(m) for m in sorted(df["month"].unique())]
+    return df, month_strs
 
 
 @st.cache_data(ttl=60)
 def load_other_expenses():
     """Load Other Expenses data from database"""
-    session = get_session()
-    try:
-        records = session.query(OtherExpense).order_by(OtherExpense.date).all()
-        data = [{
-            "date": r.date,
-            "expenses": r.expenses,
-            "months": r.months,
-            "car_emi": r.car_emi,
-            "pg_rent": r.pg_rent,
-            "total": r.total_other_expenses,
-        } for r in records]
-        return pd.DataFrame(data) if data else pd.DataFrame()
-    finally:
-        session.close()
+    stmt = select(
+        OtherExpense.date,
+        OtherExpense.expenses,
+        OtherExpense.months,
+        OtherExpense.car_emi,
+        OtherExpense.pg_rent,
+        (
+            func.coalesce(OtherExpense.expenses, 0) +
+            func.coalesce(OtherExpense.car_emi, 0) +
+            func.coalesce(OtherExpense.pg_rent, 0)
+        ).label("total"),
+    ).order_by(OtherExpense.date)
+    df = pd.read_sql(stmt, con=get_engine(), parse_dates=["date"])
+    df["month"] = df["date"].dt.to_period("M")
+    return df
+
+
+@st.cache_data(ttl=60)
+def load_monthly_summary(start_date, end_date):
+    """Aggregate daily records per month in the database"""
+    if get_engine().dialect.name == "postgresql":
+        month = func.to_char(func.date_trunc("month", DailyRecord.date), "YYYY-MM")
+    else:
+        month = func.strftime("%Y-%m", DailyRecord.date)
+    month = month.label("month")
+
+    columns = [
+        "earnings", "cng_expenses", "driver_pass_subscription",
+        "indrive_topup", "daily_net", "ride_count",
+    ]
+    stmt = (
+        select(
+            month,
+            *[func.coalesce(func.sum(getattr(DailyRecord, c)), 0).label(c) for c in columns],
+            func.count(DailyRecord.date).label("date"),  # Days worked
+        )
+        .where(DailyRecord.date.between(start_date, end_date))
+        .group_by(month)
+        .order_by(month)
+    )
+
+    summary = pd.read_sql(stmt, con=get_engine())
+    summary["month"] = pd.to_datetime(summary["month"]).dt.to_period("M")
+    return summary
 
 
 def add_record(date, ride_count, earnings, cng_expenses, driver_pass, indrive, odo_start, odo_end):
     session = get_session()
     try:
-        daily_net = earnings - cng_expenses - driver_pass - indrive
         existing = session.query(DailyRecord).filter_by(date=date).first()
 
         if existing:
@@ -114,7 +172,6 @@ def add_record(date, ride_count, earnings, cng_expenses, driver_pass, indrive, o
             existing.indrive_topup = indrive
             existing.odometer_start = odo_start if odo_start > 0 else None
             existing.odometer_end = odo_end if odo_end > 0 else None
-            existing.daily_net = int(daily_net)
         else:
             record = DailyRecord(
                 date=date,
@@ -125,7 +182,6 @@ def add_record(date, ride_count, earnings, cng_expenses, driver_pass, indrive, o
                 indrive_topup=indrive,
                 odometer_start=odo_start if odo_start > 0 else None,
                 odometer_end=odo_end if odo_end > 0 else None,
-                daily_net=int(daily_net),
             )
             session.add(record)
 
@@ -139,11 +195,58 @@ def add_record(date, ride_count, earnings, cng_expenses, driver_pass, indrive, o
         session.close()
 
 
+@st.cache_data(ttl=60)
+def build_monthly_summary(monthly_summary, other_df):
+    """Add expense totals and net profit to the per-month aggregation"""
+    # Calculate total expenses per month
+    monthly_summary['total_expenses'] = (
+        monthly_summary['cng_expenses'] +
+        monthly_summary['driver_pass_subscription'] +
+        monthly_summary['indrive_topup']
+    )
+
+    # Add other expenses if available
+    if not other_df.empty:
+        # Order comes from the left merge below, so skip sorting the groups
+        expense_summary = other_df.groupby('month', sort=False, observed=True).agg({
+            'car_emi': 'sum',
+            'pg_rent': 'sum',
+            'expenses': 'sum'
+        }).reset_index()
+
+        # Merge with daily summary
+        monthly_summary = monthly_summary.merge(expense_summary, on='month', how='left')
+        monthly_summary[['car_emi', 'pg_rent', 'expenses']] = monthly_summary[['car_emi', 'pg_rent', 'expenses']].fillna(0)
+
+        # Recalculate total with other expenses
+        monthly_summary['total_all_expenses'] = (
+            monthly_summary['total_expenses'] +
+            monthly_summary['car_emi'] +
+            monthly_summary['pg_rent'] +
+            monthly_summary['expenses']
+        )
+        monthly_summary['net_profit'] = monthly_summary['earnings'] - monthly_summary['total_all_expenses']
+    else:
+        monthly_summary['net_profit'] = monthly_summary['daily_net']
+
+    # Convert month Period to string labels for display, stored as categories
+    monthly_summary['month_str'] = monthly_summary['month'].astype(str).astype("category")
+
+    return monthly_summary
+
+
+def slice_dates(frame, start_date, end_date):
+    """Rows of a date-sorted frame between start and end, both inclusive"""
+    lo = frame["date"].searchsorted(pd.Timestamp(start_date), side="left")
+    hi = frame["date"].searchsorted(pd.Timestamp(end_date), side="right")
+    return frame.iloc[lo:hi]
+
+
 # Initialize database
-init_db()
+get_engine()
 
 # Load data
-df = load_data()
+df, month_strs = load_data()
 
 # Load other expenses data
 other_expenses_df = load_other_expenses()
@@ -162,8 +265,8 @@ else:
 
     st.sidebar.divider()
 
-    min_date = df["date"].min()
-    max_date = df["date"].max()
+    min_date = df["date"].min().date()
+    max_date = df["date"].max().date()
 
 
     filter_type = st.sidebar.radio("Analysis Type", ["Date Range", "Monthly"], index=0)
@@ -177,19 +280,19 @@ else:
         )
         if len(date_range) == 2:
             start_date, end_date = date_range
-            filtered_df = df[(df["date"] >= start_date) & (df["date"] <= end_date)]
+            filtered_df = slice_dates(df, start_date, end_date)
+            summary_range = (start_date, end_date)
         else:
             filtered_df = df
+            summary_range = (min_date, max_date)
         filter_month = None
         selected_month = None
     else:
         # Monthly filter
-        months = pd.to_datetime(df["date"]).dt.to_period("M")
-        month_list = sorted(months.unique())
-        month_strs = [str(m) for m in month_list]
         selected_month = st.sidebar.selectbox("Select Month", month_strs, index=len(month_strs)-1)
         filter_month = pd.Period(selected_month)
-        filtered_df = df[months == filter_month]
+        summary_range = (filter_month.start_time.date(), filter_month.end_time.date())
+        filtered_df = slice_dates(df, *summary_range)
 
 
 
@@ -200,21 +303,27 @@ else:
     else:
         st.header("Summary")
 
-    total_earnings = filtered_df["earnings"].sum()
+    # Sum all summary columns in a single pass
+    totals = filtered_df[[
+        "earnings", "cng_expenses", "driver_pass_subscription",
+        "indrive_topup", "daily_net", "ride_count",
+    ]].sum()
+
+    total_earnings = totals["earnings"]
     total_expenses = (
-        filtered_df["cng_expenses"].sum() +
-        filtered_df["driver_pass_subscription"].sum() +
-        filtered_df["indrive_topup"].sum()
+        totals["cng_expenses"] +
+        totals["driver_pass_subscription"] +
+        totals["indrive_topup"]
     )
-    total_profit = filtered_df["daily_net"].sum()
-    total_rides = filtered_df["ride_count"].sum()
+    total_profit = totals["daily_net"]
+    total_rides = int(totals["ride_count"])
     avg_per_ride = total_earnings / total_rides if total_rides > 0 else 0
 
     # Calculate expense breakdown
-    cng_expenses = filtered_df["cng_expenses"].sum()
+    cng_expenses = totals["cng_expenses"]
     driver_pass_expenses = (
-        filtered_df["driver_pass_subscription"].sum() +
-        filtered_df["indrive_topup"].sum()
+        totals["driver_pass_subscription"] +
+        totals["indrive_topup"]
     )
 
     # Top row - High-level metrics
@@ -234,7 +343,11 @@ else:
     if filter_type == "Monthly" and selected_month:
         st.subheader(f"Daily Records for {selected_month}")
         if not filtered_df.empty:
-            st.dataframe(filtered_df.sort_values("date"), use_container_width=True)
+            st.dataframe(
+                filtered_df.drop(columns=DERIVED_COLUMNS).sort_values("date"),
+                use_container_width=True,
+                column_config=DATE_COLUMN_CONFIG
+            )
         else:
             st.info("No records for this month.")
 
@@ -242,74 +355,35 @@ else:
     st.header("Monthly Summary")
 
     if not filtered_df.empty:
-        # Calculate monthly aggregations
-        monthly_df = filtered_df.copy()
-        monthly_df['month'] = pd.to_datetime(monthly_df['date']).dt.to_period('M')
-
-        monthly_summary = monthly_df.groupby('month').agg({
-            'earnings': 'sum',
-            'cng_expenses': 'sum',
-            'driver_pass_subscription': 'sum',
-            'indrive_topup': 'sum',
-            'daily_net': 'sum',
-            'ride_count': 'sum',
-            'date': 'count'  # Days worked
-        }).reset_index()
-
-        # Calculate total expenses per month
-        monthly_summary['total_expenses'] = (
-            monthly_summary['cng_expenses'] +
-            monthly_summary['driver_pass_subscription'] +
-            monthly_summary['indrive_topup']
+        # Monthly aggregations are computed by the database
+        monthly_summary = build_monthly_summary(
+            load_monthly_summary(*summary_range), other_expenses_df
         )
 
-        # Add other expenses if available
-        if not other_expenses_df.empty:
-            expense_monthly = other_expenses_df.copy()
-            expense_monthly['month'] = pd.to_datetime(expense_monthly['date']).dt.to_period('M')
-            expense_summary = expense_monthly.groupby('month').agg({
-                'car_emi': 'sum',
-                'pg_rent': 'sum',
-                'expenses': 'sum'
-            }).reset_index()
-
-            # Merge with daily summary
-            monthly_summary = monthly_summary.merge(expense_summary, on='month', how='left')
-            monthly_summary[['car_emi', 'pg_rent', 'expenses']] = monthly_summary[['car_emi', 'pg_rent', 'expenses']].fillna(0)
-
-            # Recalculate total with other expenses
-            monthly_summary['total_all_expenses'] = (
-                monthly_summary['total_expenses'] +
-                monthly_summary['car_emi'] +
-                monthly_summary['pg_rent'] +
-                monthly_summary['expenses']
-            )
-            monthly_summary['net_profit'] = monthly_summary['earnings'] - monthly_summary['total_all_expenses']
-        else:
-            monthly_summary['net_profit'] = monthly_summary['daily_net']
-
-        # Convert month Period to string for display
-        monthly_summary['month_str'] = monthly_summary['month'].astype(str)
-
         # Display as cards or table
         st.subheader("Monthly Performance")
 
         # Show each month's summary
-        for idx, row in monthly_summary.iterrows():
-            with st.expander(f"📅 {row['month_str']} - ₹{row['earnings']:,.0f} earnings, {row['ride_count']:,} rides", expanded=(idx == len(monthly_summary)-1)):
+        last_idx = len(monthly_summary) - 1
+        for idx, row in enumerate(monthly_summary.itertuples(index=False)):
+            total_all_expenses = getattr(row, 'total_all_expenses', row.total_expenses)
+            car_emi = getattr(row, 'car_emi', 0)
+            pg_rent = getattr(row, 'pg_rent', 0)
+
+            with st.expander(f"📅 {row.month_str} - ₹{row.earnings:,.0f} earnings, {row.ride_count:,} rides", expanded=(idx == last_idx)):
                 col1, col2, col3, col4 = st.columns(4)
-                col1.metric("Total Earnings", f"₹{row['earnings']:,.0f}")
-                col2.metric("Total Expenses", f"₹{row.get('total_all_expenses', row['total_expenses']):,.0f}")
-                col3.metric("Net Profit", f"₹{row['net_profit']:,.0f}")
-                col4.metric("Days Worked", f"{row['date']}")
+                col1.metric("Total Earnings", f"₹{row.earnings:,.0f}")
+                col2.metric("Total Expenses", f"₹{total_all_expenses:,.0f}")
+                col3.metric("Net Profit", f"₹{row.net_profit:,.0f}")
+                col4.metric("Days Worked", f"{row.date}")
 
                 # Show detailed breakdown if other expenses exist
-                if not other_expenses_df.empty and row.get('car_emi', 0) > 0:
+                if not other_expenses_df.empty and car_emi > 0:
                     st.caption("**Expense Breakdown:**")
                     exp_col1, exp_col2, exp_col3 = st.columns(3)
-                    exp_col1.caption(f"Daily Ops: ₹{row['total_expenses']:,.0f}")
-                    exp_col2.caption(f"Car EMI: ₹{row.get('car_emi', 0):,.0f}")
-                    exp_col3.caption(f"PG Rent: ₹{row.get('pg_rent', 0):,.0f}")
+                    exp_col1.caption(f"Daily Ops: ₹{row.total_expenses:,.0f}")
+                    exp_col2.caption(f"Car EMI: ₹{car_emi:,.0f}")
+                    exp_col3.caption(f"PG Rent: ₹{pg_rent:,.0f}")
     else:
         st.info("No data available for selected date range")
 
@@ -319,101 +393,105 @@ else:
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["Earnings Trend", "Expense Breakdown", "Daily Performance", "Profit Analysis", "Other Expenses"])
 
     with tab1:
-        fig = px.line(
-            filtered_df,
-            x="date",
-            y=["earnings", "daily_net"],
-            title="Earnings & Profit Over Time",
-            labels={"value": "Amount (₹)", "date": "Date", "variable": "Metric"},
-        )
-        fig.update_layout(hovermode="x unified")
-        st.plotly_chart(fig, use_container_width=True)
+        if filtered_df.empty:
+            st.info("No data available for selected date range")
+        else:
+            fig = px.line(
+                filtered_df,
+                x="date",
+                y=["earnings", "daily_net"],
+                title="Earnings & Profit Over Time",
+                labels={"value": "Amount (₹)", "date": "Date", "variable": "Metric"},
+                render_mode="webgl",
+            )
+            fig.update_layout(hovermode="x unified")
+            st.plotly_chart(fig, use_container_width=True)
 
     with tab2:
         expense_data = pd.DataFrame({
             "Category": ["CNG/Fuel", "Driver Pass + OLA", "InDrive Top-up"],
             "Amount": [
-                filtered_df["cng_expenses"].sum(),
-                filtered_df["driver_pass_subscription"].sum(),
-                filtered_df["indrive_topup"].sum()
+                totals["cng_expenses"],
+                totals["driver_pass_subscription"],
+                totals["indrive_topup"]
             ]
         })
         expense_data = expense_data[expense_data["Amount"] > 0]
 
-        fig = px.pie(
-            expense_data,
-            values="Amount",
-            names="Category",
-            title="Expense Distribution",
-            hole=0.4
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        if expense_data.empty:
+            st.info("No expenses recorded for selected date range")
+        else:
+            fig = px.pie(
+                expense_data,
+                values="Amount",
+                names="Category",
+                title="Expense Distribution",
+                hole=0.4
+            )
+            st.plotly_chart(fig, use_container_width=True)
 
     with tab3:
-        fig = px.bar(
-            filtered_df,
-            x="date",
-            y="ride_count",
-            title="Daily Ride Count",
-            labels={"ride_count": "Rides", "date": "Date"}
-        )
-        st.plotly_chart(fig, use_container_width=True)
-
-        # Weekly aggregation
-        weekly_df = filtered_df.copy()
-        weekly_df["week"] = pd.to_datetime(weekly_df["date"]).dt.isocalendar().week
-        weekly_df["year"] = pd.to_datetime(weekly_df["date"]).dt.year
-        weekly_agg = weekly_df.groupby(["year", "week"]).agg({
-            "earnings": "sum",
-            "daily_net": "sum",
-            "ride_count": "sum"
-        }).reset_index()
-        weekly_agg["week_label"] = weekly_agg["year"].astype(str) + "-W" + weekly_agg["week"].astype(str)
-
-        fig2 = px.bar(
-            weekly_agg,
-            x="week_label",
-            y=["earnings", "daily_net"],
-            title="Weekly Earnings vs Profit",
-            labels={"value": "Amount (₹)", "week_label": "Week"},
-            barmode="group"
-        )
-        st.plotly_chart(fig2, use_container_width=True)
+        if filtered_df.empty:
+            st.info("No data available for selected date range")
+        else:
+            fig = px.bar(
+                filtered_df,
+                x="date",
+                y="ride_count",
+                title="Daily Ride Count",
+                labels={"ride_count": "Rides", "date": "Date"}
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Weekly aggregation
+            weekly_agg = filtered_df.groupby(["iso_year", "iso_week"]).agg({
+                "earnings": "sum",
+                "daily_net": "sum",
+                "ride_count": "sum"
+            }).reset_index()
+            weekly_agg["week_label"] = weekly_agg["iso_year"].astype(str) + "-W" + weekly_agg["iso_week"].astype(str)
+
+            fig2 = px.bar(
+                weekly_agg,
+                x="week_label",
+                y=["earnings", "daily_net"],
+                title="Weekly Earnings vs Profit",
+                labels={"value": "Amount (₹)", "week_label": "Week"},
+                barmode="group"
+            )
+            st.plotly_chart(fig2, use_container_width=True)
 
     with tab4:
-        # Profit margin over time
-        profit_df = filtered_df.copy()
-        profit_df["profit_margin"] = (profit_df["daily_net"] / profit_df["earnings"] * 100).fillna(0)
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=profit_df["date"],
-            y=profit_df["profit_margin"],
-            mode="lines+markers",
-            name="Profit Margin %",
-            line=dict(color="green")
-        ))
-        fig.add_hline(y=profit_df["profit_margin"].mean(), line_dash="dash",
-                      annotation_text=f"Avg: {profit_df['profit_margin'].mean():.1f}%")
-        fig.update_layout(
-            title="Daily Profit Margin",
-            xaxis_title="Date",
-            yaxis_title="Profit Margin (%)"
-        )
-        st.plotly_chart(fig, use_container_width=True)
-
-        # Cumulative profit
-        cumulative_df = filtered_df.copy()
-        cumulative_df["cumulative_profit"] = cumulative_df["daily_net"].cumsum()
-
-        fig2 = px.area(
-            cumulative_df,
-            x="date",
-            y="cumulative_profit",
-            title="Cumulative Profit",
-            labels={"cumulative_profit": "Total Profit (₹)", "date": "Date"}
-        )
-        st.plotly_chart(fig2, use_container_width=True)
+        if filtered_df.empty:
+            st.info("No data available for selected date range")
+        else:
+            # Profit margin over time
+            fig = go.Figure()
+            fig.add_trace(go.Scattergl(
+                x=filtered_df["date"],
+                y=filtered_df["profit_margin"],
+                mode="lines+markers",
+                name="Profit Margin %",
+                line=dict(color="green")
+            ))
+            avg_margin = filtered_df["profit_margin"].mean()
+            fig.add_hline(y=avg_margin, line_dash="dash",
+                          annotation_text=f"Avg: {avg_margin:.1f}%")
+            fig.update_layout(
+                title="Daily Profit Margin",
+                xaxis_title="Date",
+                yaxis_title="Profit Margin (%)"
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Cumulative profit (depends on the selected range, so not precomputed)
+            fig2 = px.area(
+                x=filtered_df["date"],
+                y=filtered_df["daily_net"].cumsum(),
+                title="Cumulative Profit",
+                labels={"y": "Total Profit (₹)", "x": "Date"}
+            )
+            st.plotly_chart(fig2, use_container_width=True)
 
 
     with tab5:
@@ -424,13 +502,9 @@ else:
         else:
             # Filter other expenses by sidebar selection
             if filter_type == "Date Range" and 'start_date' in locals() and 'end_date' in locals():
-                filtered_expenses = other_expenses_df[
-                    (other_expenses_df["date"] >= start_date) &
-                    (other_expenses_df["date"] <= end_date)
-                ]
+                filtered_expenses = slice_dates(other_expenses_df, start_date, end_date)
             elif filter_type == "Monthly" and filter_month is not None:
-                months_exp = pd.to_datetime(other_expenses_df["date"]).dt.to_period("M")
-                filtered_expenses = other_expenses_df[months_exp == filter_month]
+                filtered_expenses = slice_dates(other_expenses_df, *summary_range)
             else:
                 filtered_expenses = other_expenses_df
 
@@ -465,10 +539,12 @@ else:
 
                 # Line chart - EMI and Rent over time
                 st.subheader("Fixed Expenses Over Time")
-                if len(filtered_expenses) > 1:
+                has_emi = expense_totals.get("Car EMI", 0) > 0
+                has_rent = expense_totals.get("PG Rent", 0) > 0
+                if len(filtered_expenses) > 1 and (has_emi or has_rent):
                     fig = go.Figure()
 
-                    if filtered_expenses['car_emi'].sum() > 0:
+                    if has_emi:
                         fig.add_trace(go.Scatter(
                             x=filtered_expenses['date'],
                             y=filtered_expenses['car_emi'],
@@ -477,7 +553,7 @@ else:
                             line=dict(color='red')
                         ))
 
-                    if filtered_expenses['pg_rent'].sum() > 0:
+                    if has_rent:
                         fig.add_trace(go.Scatter(
                             x=filtered_expenses['date'],
                             y=filtered_expenses['pg_rent'],
@@ -496,12 +572,12 @@ else:
 
                 # Detailed table
                 st.subheader("Expense Records")
-                display_expenses = filtered_expenses.copy()
-                display_expenses = display_expenses.sort_values('date', ascending=False)
+                display_expenses = filtered_expenses.sort_values('date', ascending=False)
                 st.dataframe(
                     display_expenses[['date', 'expenses', 'car_emi', 'pg_rent', 'total']],
                     use_container_width=True,
-                    hide_index=True
+                    hide_index=True,
+                    column_config=DATE_COLUMN_CONFIG
                 )
 
 # Data entry section
@@ -582,4 +658,8 @@ if other_submitted:
 # Raw data view
 with st.expander("View Raw Data"):
     if not df.empty:
-        st.dataframe(df.sort_values("date", ascending=False), use_container_width=True)
+        st.dataframe(
+            df.drop(columns=DERIVED_COLUMNS).sort_values("date", ascending=False),
+            use_container_width=True,
+            column_config=DATE_COLUMN_CONFIG
+        )
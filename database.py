@@ -1,5 +1,6 @@
 import os
-from sqlalchemy import create_engine, Column, Integer, Float, Date, String
+from sqlalchemy import create_engine, func, Column, Integer, Float, Date, String
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 
@@ -14,11 +15,16 @@ DATABASE_URL = os.getenv(
 if DATABASE_URL.startswith("sqlite"):
     engine = create_engine(
         DATABASE_URL,
-        connect_args={"check_same_thread": False}  # SQLite multi-threading
+        connect_args={"check_same_thread": False},  # SQLite multi-threading
+        pool_pre_ping=True
     )
 else:
     # PostgreSQL (Supabase) - no special connect_args needed
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(
+        DATABASE_URL,
+        pool_pre_ping=True,  # Drop connections closed by the server while idle
+        pool_size=5
+    )
 SessionLocal = sessionmaker(bind=engine)
 Base = declarative_base()
 
@@ -27,7 +33,7 @@ class DailyRecord(Base):
     __tablename__ = "daily_records"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    date = Column(Date, nullable=False, unique=True)
+    date = Column(Date, nullable=False, unique=True, index=True)
     ride_count = Column(Integer, default=0)
     earnings = Column(Integer, default=0)
     cng_expenses = Column(Integer, default=0)
@@ -35,7 +41,20 @@ class DailyRecord(Base):
     indrive_topup = Column(Float, default=0)
     odometer_start = Column(Float, nullable=True)
     odometer_end = Column(Float, nullable=True)
-    daily_net = Column(Integer, default=0)
+
+    @hybrid_property
+    def daily_net(self):
+        """Earnings minus all expenses; not stored, computed on read"""
+        return self.earnings - self.total_expenses
+
+    @daily_net.expression
+    def daily_net(cls):
+        return (
+            cls.earnings -
+            cls.cng_expenses -
+            func.coalesce(cls.driver_pass_subscription, 0) -
+            func.coalesce(cls.indrive_topup, 0)
+        )
 
     @property
     def total_expenses(self):
@@ -56,7 +75,7 @@ class OtherExpense(Base):
     __tablename__ = "other_expenses"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    date = Column(Date, nullable=False, unique=True)
+    date = Column(Date, nullable=False, unique=True, index=True)
     expenses = Column(Float, default=0)
     months = Column(String, nullable=True)
     car_emi = Column(Float, default=0)
@@ -4,7 +4,13 @@ One-time script to import data from Taxi_Earnings_Record.xlsx to SQLite.
 
 import pandas as pd
 from datetime import datetime, date
-from database import init_db, get_session, DailyRecord, OtherExpense
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from database import engine, init_db, get_session, DailyRecord, OtherExpense
+
+
+DAILY_SHEETS = ["Daily Record 2025", "Daily Record 2026"]
+EXPENSE_SHEETS = ["Other Expenses 2025", "Other Expenses 2026"]
 
 
 # ===================== UTIL =====================
@@ -21,16 +27,41 @@ def normalize_date(raw_date):
         raise ValueError(f"Invalid date format: {raw_date}")
 
 
+def upsert_by_date(session, model, rows):
+    """
+    Bulk insert rows into the model's table, updating rows whose date
+    already exists. Returns (added, updated) counts.
+    """
+    dates = [row["date"] for row in rows]
+    existing = set(session.scalars(
+        select(model.date).where(model.date.in_(dates))
+    ))
+
+    dialect = postgresql if engine.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(model.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["date"],
+        set_={key: stmt.excluded[key] for key in rows[0] if key != "date"},
+    )
+    session.execute(stmt, rows)
+
+    updated = sum(1 for d in dates if d in existing)
+    return len(rows) - updated, updated
+
+
 # ================= DAILY RECORD =================
 
-def import_daily_records(excel_path: str):
+def import_daily_records(excel_path: str, sheets_dict=None):
 
-    sheets = ["Daily Record 2025", "Daily Record 2026"]
     all_df = []
 
-    for sheet in sheets:
+    # Parse all sheets in one pass unless the caller already read them
+    if sheets_dict is None:
+        sheets_dict = pd.read_excel(excel_path, sheet_name=DAILY_SHEETS)
+
+    for sheet in DAILY_SHEETS:
+        df = sheets_dict[sheet]
         print(f"Reading sheet: {sheet}")
-        df = pd.read_excel(excel_path, sheet_name=sheet)
 
         if df.empty:
             continue
@@ -44,16 +75,8 @@ def import_daily_records(excel_path: str):
             "InDrive Top-up": "indrive_topup",
             "Odometer(Km)": "odometer_start",
             "EOD Odometer(km)": "odometer_end",
-            "Daily Net (₹)": "daily_net",
         })
 
-        df['daily_net'] = (
-            df['earnings'] -
-            df['cng_expenses'] -
-            df['driver_pass_subscription'].fillna(0) -
-            df['indrive_topup'].fillna(0)
-        )
-
         df = df.fillna(0)
         print(f"  Loaded {len(df)} records")
         all_df.append(df)
@@ -61,42 +84,32 @@ def import_daily_records(excel_path: str):
     combined = pd.concat(all_df, ignore_index=True)
     combined = combined.sort_values('date')
 
+    combined['date'] = combined['date'].map(normalize_date)
+    combined = combined.astype({
+        'ride_count': 'int64',
+        'earnings': 'int64',
+        'cng_expenses': 'int64',
+        'driver_pass_subscription': 'float64',
+        'indrive_topup': 'float64',
+    })
+
+    # Zero odometer readings mean "not recorded"
+    odometer_cols = ['odometer_start', 'odometer_end']
+    combined[odometer_cols] = combined[odometer_cols].astype(object)\
+        .where(combined[odometer_cols] > 0, None)
+
+    rows = combined[[
+        'date', 'ride_count', 'earnings', 'cng_expenses',
+        'driver_pass_subscription', 'indrive_topup',
+        'odometer_start', 'odometer_end',
+    ]].to_dict(orient="records")
+
     session = get_session()
     added = updated = 0
 
     try:
-        for _, row in combined.iterrows():
-
-            record_date = normalize_date(row["date"])
-
-            with session.no_autoflush:
-                existing = session.query(DailyRecord)\
-                    .filter_by(date=record_date).first()
-
-            if existing:
-                existing.ride_count = int(row["ride_count"])
-                existing.earnings = int(row["earnings"])
-                existing.cng_expenses = int(row["cng_expenses"])
-                existing.driver_pass_subscription = float(row["driver_pass_subscription"])
-                existing.indrive_topup = float(row["indrive_topup"])
-                existing.odometer_start = float(row["odometer_start"]) if row["odometer_start"] else None
-                existing.odometer_end = float(row["odometer_end"]) if row["odometer_end"] else None
-                existing.daily_net = int(row["daily_net"])
-                updated += 1
-            else:
-                record = DailyRecord(
-                    date=record_date,
-                    ride_count=int(row["ride_count"]),
-                    earnings=int(row["earnings"]),
-                    cng_expenses=int(row["cng_expenses"]),
-                    driver_pass_subscription=float(row["driver_pass_subscription"]),
-                    indrive_topup=float(row["indrive_topup"]),
-                    odometer_start=float(row["odometer_start"]) if row["odometer_start"] else None,
-                    odometer_end=float(row["odometer_end"]) if row["odometer_end"] else None,
-                    daily_net=int(row["daily_net"]),
-                )
-                session.add(record)
-                added += 1
+        if rows:
+            added, updated = upsert_by_date(session, DailyRecord, rows)
 
         session.commit()
         print(f"  Added: {added}")
@@ -113,14 +126,17 @@ def import_daily_records(excel_path: str):
 
 # ================= OTHER EXPENSE =================
 
-def import_other_expenses(excel_path: str):
+def import_other_expenses(excel_path: str, sheets_dict=None):
 
-    sheets = ["Other Expenses 2025", "Other Expenses 2026"]
     all_df = []
 
-    for sheet in sheets:
+    # Parse all sheets in one pass unless the caller already read them
+    if sheets_dict is None:
+        sheets_dict = pd.read_excel(excel_path, sheet_name=EXPENSE_SHEETS)
+
+    for sheet in EXPENSE_SHEETS:
+        df = sheets_dict[sheet]
         print(f"Reading sheet: {sheet}")
-        df = pd.read_excel(excel_path, sheet_name=sheet)
 
         if df.empty:
             continue
@@ -148,34 +164,25 @@ def import_other_expenses(excel_path: str):
     combined = pd.concat(all_df, ignore_index=True)
     combined = combined.sort_values('date')
 
+    combined['date'] = combined['date'].map(normalize_date)
+    combined = combined.astype({
+        'expenses': 'float64',
+        'car_emi': 'float64',
+        'pg_rent': 'float64',
+    })
+    combined['months'] = combined['months'].astype(str)\
+        .where(combined['months'].notna(), None)
+
+    rows = combined[[
+        'date', 'expenses', 'months', 'car_emi', 'pg_rent',
+    ]].to_dict(orient="records")
+
     session = get_session()
     added = updated = 0
 
     try:
-        for _, row in combined.iterrows():
-
-            record_date = normalize_date(row["date"])
-
-            with session.no_autoflush:
-                existing = session.query(OtherExpense)\
-                    .filter_by(date=record_date).first()
-
-            if existing:
-                existing.expenses = float(row["expenses"])
-                existing.months = str(row["months"]) if pd.notna(row["months"]) else None
-                existing.car_emi = float(row["car_emi"])
-                existing.pg_rent = float(row["pg_rent"])
-                updated += 1
-            else:
-                record = OtherExpense(
-                    date=record_date,
-                    expenses=float(row["expenses"]),
-                    months=str(row["months"]) if pd.notna(row["months"]) else None,
-                    car_emi=float(row["car_emi"]),
-                    pg_rent=float(row["pg_rent"]),
-                )
-                session.add(record)
-                added += 1
+        if rows:
+            added, updated = upsert_by_date(session, OtherExpense, rows)
 
         session.commit()
         print(f"  Added: {added}")
@@ -197,11 +204,15 @@ def import_excel_to_db(excel_path="Taxi_Earnings_Record.xlsx"):
     print("Initializing database...")
     init_db()
 
+    # Open the workbook once for both imports
+    print("Reading workbook...")
+    sheets_dict = pd.read_excel(excel_path, sheet_name=DAILY_SHEETS + EXPENSE_SHEETS)
+
     print("\nIMPORTING DAILY RECORDS")
-    d_add, d_upd = import_daily_records(excel_path)
+    d_add, d_upd = import_daily_records(excel_path, sheets_dict)
 
     print("\nIMPORTING OTHER EXPENSES")
-    e_add, e_upd = import_other_expenses(excel_path)
+    e_add, e_upd = import_other_expenses(excel_path, sheets_dict)
 
     print("\nIMPORT COMPLETE")
     print(f"Daily: {d_add} added, {d_upd} updated")